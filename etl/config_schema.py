@@ -17,6 +17,8 @@ class ProjectConfig(BaseModel):
     write_encoding: str = "utf-8"
     on_bad_lines: str = "warn"
     deduplicate_columns: list[str] = Field(default_factory=list)
+    categorical_columns: list[str] = Field(default_factory=list)
+    load_backend: str = Field(default="stdio")
 
     @field_validator("on_bad_lines")
     @classmethod
@@ -31,3 +33,10 @@ class ProjectConfig(BaseModel):
         if v not in {"text", "json"}:
             raise ValueError("log_format must be one of 'text', 'json'")
         return v
+
+    @field_validator("load_backend")
+    @classmethod
+    def validate_load_backend(cls, v: str) -> str:
+        if v not in {"stdio", "io_uring"}:
+            raise ValueError("load_backend must be one of 'stdio', 'io_uring'")
+        return v
@@ -8,7 +8,7 @@ class ExtractionError(ETLError):
     pass
 
 class TransformationError(ETLError):
-    """Raised during the transformation phase (Dask processing)."""
+    """Raised during the transformation phase (Arrow processing)."""
     pass
 
 class LoadingError(ETLError):
@@ -1,99 +1,189 @@
+import json
 import logging
+import os
+import queue
+import random
+import threading
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import requests
-from dwcahandler.dwca import MetaDwCA
 
 from etl.exceptions import ExtractionError
 
+if TYPE_CHECKING:
+    from dwcahandler.dwca import MetaDwCA
 
+try:
+    from lxml import etree
+except ImportError:  # Without lxml, meta.xml is parsed through dwcahandler instead
+    etree = None
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+DOWNLOAD_QUEUE_SIZE = 16
+META_CACHE_FILENAME = ".meta_cache.json"
+META_XML_TAGS = ("{*}core", "{*}extension", "{*}id", "{*}coreid", "{*}field", "{*}location")
+# Escaped delimiter specifications in meta.xml, translated the same way dwcahandler does.
+META_DELIMITER_ESCAPES = {"\\t": "\t", "\\n": "\n", "&quot;": '"'}
+
+
+@dataclass(slots=True, frozen=True)
 class FieldMetadata:
     index: int | None
     term: str
-    name: str | None
-    default: str | None
+    default: str | None = None
+    name: str | None = field(init=False)
 
-    def __init__(self, index: int | None, term: str, default: str | None = None):
-        self.index = index
-        self.term = term
-        self.name = term.split("/")[-1] if term else None
-        self.default = default
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "name", self.term.rpartition("/")[2] if self.term else None)
 
 
+@dataclass(slots=True, frozen=True)
 class FileMetadata:
-    def __init__(
-        self,
-        file_path: Path,
-        row_type: str,
-        fields: list[FieldMetadata],
-        fields_terminated_by: str,
-        ignore_header_lines: int,
-        id_index: int | None = None,
-        coreid_index: int | None = None,
-    ):
-        self.file_path = file_path
-        self.row_type = row_type
-        self.fields = fields
-        self.fields_terminated_by = fields_terminated_by
-        self.ignore_header_lines = ignore_header_lines
-        self.id_index = id_index
-        self.coreid_index = coreid_index  # For extension file
+    file_path: Path
+    row_type: str
+    fields: tuple[FieldMetadata, ...]
+    fields_terminated_by: str
+    ignore_header_lines: int
+    id_index: int | None = None
+    coreid_index: int | None = None  # For extension file
 
     def get_header(self, core_id_column_name: str | None = None) -> tuple[list[str], list[FieldMetadata]]:
-        header_map: dict[int, str] = {}
-        max_index = -1
-        default_fields_metadata: list[FieldMetadata] = []
-
-        for field in self.fields:
-            if field.index is not None:
-                header_map[field.index] = field.name or ""
-                max_index = max(max_index, field.index)
-            elif field.default is not None and field.name is not None:
-                default_fields_metadata.append(field)
-
-        if core_id_column_name is not None:
-            if self.coreid_index is not None:  # This is for extension files
-                header_map[self.coreid_index] = core_id_column_name
-                max_index = max(max_index, self.coreid_index)
-            elif self.id_index is not None:  # This is for the core file itself
-                # Check if id_index is already mapped by a field. If not, add core_id_column_name.
-                if self.id_index not in header_map:
-                    header_map[self.id_index] = core_id_column_name
-                max_index = max(max_index, self.id_index)
-
-        indexed_header = [header_map.get(i, "") for i in range(max_index + 1)]
-        return indexed_header, default_fields_metadata
+        indexed_header, default_fields_metadata = _build_header(self, core_id_column_name)
+        return list(indexed_header), list(default_fields_metadata)
+
+
+@cache
+def _build_header(
+    file_metadata: FileMetadata, core_id_column_name: str | None
+) -> tuple[tuple[str, ...], tuple[FieldMetadata, ...]]:
+    """Builds the index-ordered header once per (metadata, core id column) pair."""
+    header_map = {f.index: f.name or "" for f in file_metadata.fields if f.index is not None}
+    default_fields_metadata = [
+        f for f in file_metadata.fields if f.index is None and f.default is not None and f.name is not None
+    ]
+    max_index = max(header_map, default=-1)
+
+    if core_id_column_name is not None:
+        if file_metadata.coreid_index is not None:  # This is for extension files
+            header_map[file_metadata.coreid_index] = core_id_column_name
+            max_index = max(max_index, file_metadata.coreid_index)
+        elif file_metadata.id_index is not None:  # This is for the core file itself
+            # Check if id_index is already mapped by a field. If not, add core_id_column_name.
+            if file_metadata.id_index not in header_map:
+                header_map[file_metadata.id_index] = core_id_column_name
+            max_index = max(max_index, file_metadata.id_index)
+
+    indexed_header = [header_map.get(i, "") for i in range(max_index + 1)]
+    return tuple(indexed_header), tuple(default_fields_metadata)
+
+
+@dataclass(slots=True)
+class ArchiveMetadata:
+    core: FileMetadata
+    extensions: list[FileMetadata]
 
 
-class ArchiveMetadata:
-    def __init__(self, core: FileMetadata, extensions: list[FileMetadata]):
-        self.core = core
-        self.extensions = extensions
+def _stream_to_file(response: requests.Response, dest: Path) -> None:
+    """Writes a streamed response body to dest.
 
+    Chunks are handed to a background writer thread through a bounded queue so that
+    receiving the next chunk from the network overlaps with writing the previous one to disk.
+    """
+    chunks: queue.Queue[bytes | None] = queue.Queue(maxsize=DOWNLOAD_QUEUE_SIZE)
+    errors: list[BaseException] = []
 
-def download_data(url: str, dest: Path, retries: int = 3, backoff_factor: float = 0.3) -> None:
-    """Downloads a file from a URL, with retries on failure."""
-    logging.info(f"Downloading from {url}...")
-    for i in range(retries):
+    def _writer() -> None:
         try:
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
             with dest.open("wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                while (chunk := chunks.get()) is not None:
                     f.write(chunk)
-            logging.info(f"Download complete: {dest}")
-            return
-        except requests.exceptions.RequestException as e:
-            if i < retries - 1:
-                sleep_time = backoff_factor * (2**i)
-                logging.warning(f"Download failed (attempt {i + 1}/{retries}). Retrying in {sleep_time:.2f} seconds...")
-                time.sleep(sleep_time)
-            else:
-                error_msg = f"Failed to download {url} after {retries} attempts: {e}"
-                logging.error(error_msg)
-                raise ExtractionError(error_msg) from e
+        except BaseException as e:
+            errors.append(e)
+            # Keep draining so the producer never blocks on a full queue.
+            while chunks.get() is not None:
+                pass
+
+    writer = threading.Thread(target=_writer, name="download-writer", daemon=True)
+    writer.start()
+    try:
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if errors:
+                break
+            chunks.put(chunk)
+    finally:
+        chunks.put(None)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
+
+def download_data(url: str, dest: Path, retries: int = 3, backoff_factor: float = 0.3) -> None:
+    """Downloads a file from a URL, with retries on failure.
+
+    All attempts share one session, so a retry can reuse the pooled connection instead of
+    repeating the TCP/TLS handshake. Retry delays use full jitter.
+    """
+    logging.info(f"Downloading from {url}...")
+    with requests.Session() as session:
+        for i in range(retries):
+            try:
+                with session.get(url, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    _stream_to_file(response, dest)
+                logging.info(f"Download complete: {dest}")
+                return
+            except requests.exceptions.RequestException as e:
+                if i < retries - 1:
+                    sleep_time = random.uniform(0, backoff_factor * (2**i))
+                    logging.warning(
+                        f"Download failed (attempt {i + 1}/{retries}). Retrying in {sleep_time:.2f} seconds..."
+                    )
+                    time.sleep(sleep_time)
+                else:
+                    error_msg = f"Failed to download {url} after {retries} attempts: {e}"
+                    logging.error(error_msg)
+                    raise ExtractionError(error_msg) from e
+
+
+def _extract_members(zip_path: Path, members: list[zipfile.ZipInfo], out_dir: Path) -> None:
+    """Extracts the given members using a ZipFile handle private to the calling thread."""
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info in members:
+            zip_ref.extract(info, out_dir)
+
+
+def _extract_parallel(zip_ref: zipfile.ZipFile, zip_path: Path, out_dir: Path) -> None:
+    """Extracts all members concurrently, one ZipFile handle per worker.
+
+    zlib releases the GIL while inflating, so entries decompress in parallel. Each worker
+    reads through its own file handle, which keeps the shared read offset out of the way.
+    """
+    infos = zip_ref.infolist()
+    files = [info for info in infos if not info.is_dir()]
+
+    # Create every target directory up front so workers never race on makedirs.
+    for info in infos:
+        parts = [p for p in info.filename.split("/")[:-1] if p not in ("", ".", "..")]
+        out_dir.joinpath(*parts).mkdir(parents=True, exist_ok=True)
+
+    workers = min(len(files), os.cpu_count() or 1)
+    if workers <= 1:
+        zip_ref.extractall(out_dir)
+        return
+
+    # Largest entries first, dealt round-robin, to roughly balance the work per thread.
+    files.sort(key=lambda info: info.file_size, reverse=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_extract_members, zip_path, files[i::workers], out_dir) for i in range(workers)]
+        for future in futures:
+            future.result()
 
 
 def extract_archive(zip_path: Path, out_dir: Path) -> None:
@@ -106,7 +196,11 @@ def extract_archive(zip_path: Path, out_dir: Path) -> None:
             raise ExtractionError(error_msg)
 
         with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(out_dir)
+            if any(info.flag_bits & 0x1 for info in zip_ref.infolist()):
+                # Encrypted entries are left to zipfile's own sequential handling.
+                zip_ref.extractall(out_dir)
+            else:
+                _extract_parallel(zip_ref, zip_path, out_dir)
 
         logging.info(f"Extraction complete: all files extracted to {out_dir}")
     except zipfile.BadZipFile as e:
@@ -119,7 +213,7 @@ def extract_archive(zip_path: Path, out_dir: Path) -> None:
         raise ExtractionError(error_msg) from e
 
 
-def map_dwca_metadata(meta_dwca: MetaDwCA, archive_dir: Path) -> ArchiveMetadata:
+def map_dwca_metadata(meta_dwca: "MetaDwCA", archive_dir: Path) -> ArchiveMetadata:
     """Maps dwcahandler's metadata objects to internal FileMetadata and ArchiveMetadata."""
     core_meta = None
     extensions_meta = []
@@ -146,7 +240,7 @@ def map_dwca_metadata(meta_dwca: MetaDwCA, archive_dir: Path) -> ArchiveMetadata
         file_metadata = FileMetadata(
             file_path=file_path,
             row_type=element.meta_element_type.type.value if element.meta_element_type.type else "",
-            fields=fields,
+            fields=tuple(fields),
             fields_terminated_by=delimiter,
             ignore_header_lines=ignore_header_lines,
             id_index=id_index if element.meta_element_type.core_or_ext_type.value == "core" else None,
@@ -164,17 +258,159 @@ def map_dwca_metadata(meta_dwca: MetaDwCA, archive_dir: Path) -> ArchiveMetadata
     return ArchiveMetadata(core_meta, extensions_meta)
 
 
+def iterparse_meta_xml(meta_path: Path) -> ArchiveMetadata:
+    """Builds archive metadata from meta.xml with lxml's iterparse, without building a DOM.
+
+    Mirrors dwcahandler's reading of meta.xml (first core, extensions in order, the first
+    files/location, id for the core and coreid for extensions) and the defaults from
+    apply_dwcahandler_patches for attributes that are missing.
+    """
+    archive_dir = meta_path.parent
+    core_meta: FileMetadata | None = None
+    extensions_meta: list[FileMetadata] = []
+    fields: list[FieldMetadata] = []
+    id_index: int | None = None
+    location = ""
+    scope = ""
+
+    for event, elem in etree.iterparse(
+        str(meta_path), events=("start", "end"), tag=META_XML_TAGS, resolve_entities=False, no_network=True
+    ):
+        tag = etree.QName(elem).localname
+        if event == "start":
+            if tag in ("core", "extension"):
+                scope, fields, id_index, location = tag, [], None, ""
+            continue
+
+        if tag == "field":
+            index = elem.get("index")
+            fields.append(
+                FieldMetadata(
+                    index=int(index) if index else None,
+                    term=elem.get("term") or "",
+                    default=elem.get("default") or None,
+                )
+            )
+        elif tag == ("id" if scope == "core" else "coreid"):
+            index = elem.get("index")
+            if id_index is None and index:
+                id_index = int(index)
+        elif tag == "location":
+            location = location or (elem.text or "").strip()
+        elif tag in ("core", "extension"):
+            delimiter = elem.get("fieldsTerminatedBy", ",")
+            file_metadata = FileMetadata(
+                file_path=archive_dir / location,
+                row_type=elem.get("rowType", ""),
+                fields=tuple(fields),
+                fields_terminated_by=META_DELIMITER_ESCAPES.get(delimiter, delimiter),
+                ignore_header_lines=int(elem.get("ignoreHeaderLines") or 0),
+                id_index=id_index if tag == "core" else None,
+                coreid_index=id_index if tag == "extension" else None,
+            )
+            if tag == "extension":
+                extensions_meta.append(file_metadata)
+            elif core_meta is None:
+                core_meta = file_metadata
+            elem.clear()
+
+    if not core_meta:
+        raise ExtractionError("No core file metadata found in meta.xml.")
+
+    return ArchiveMetadata(core_meta, extensions_meta)
+
+
+def _file_metadata_to_dict(file_metadata: FileMetadata, archive_dir: Path) -> dict[str, Any]:
+    data = asdict(file_metadata)
+    # Locations are stored relative to the archive so the cache survives moving it; absolute ones
+    # (allowed by meta.xml) are kept as they are and joined back unchanged on load.
+    file_path = file_metadata.file_path
+    data["file_path"] = str(file_path.relative_to(archive_dir) if file_path.is_relative_to(archive_dir) else file_path)
+    for field_data in data["fields"]:
+        del field_data["name"]  # Derived from term on load.
+    return data
+
+
+def _file_metadata_from_dict(data: dict[str, Any], archive_dir: Path) -> FileMetadata:
+    return FileMetadata(
+        file_path=archive_dir / data["file_path"],
+        row_type=data["row_type"],
+        fields=tuple(FieldMetadata(**field_data) for field_data in data["fields"]),
+        fields_terminated_by=data["fields_terminated_by"],
+        ignore_header_lines=data["ignore_header_lines"],
+        id_index=data["id_index"],
+        coreid_index=data["coreid_index"],
+    )
+
+
+def _load_meta_cache(cache_path: Path, cache_key: list[int]) -> ArchiveMetadata | None:
+    """Returns the cached metadata if it was built from the current meta.xml, otherwise None."""
+    try:
+        with cache_path.open(encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["key"] != cache_key:
+            return None
+        archive_dir = cache_path.parent
+        return ArchiveMetadata(
+            core=_file_metadata_from_dict(cached["core"], archive_dir),
+            extensions=[_file_metadata_from_dict(ext, archive_dir) for ext in cached["extensions"]],
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logging.warning(f"Ignoring unreadable metadata cache {cache_path}: {e}")
+        return None
+
+
+def _save_meta_cache(cache_path: Path, cache_key: list[int], archive_metadata: ArchiveMetadata) -> None:
+    archive_dir = cache_path.parent
+    try:
+        cached = {
+            "key": cache_key,
+            "core": _file_metadata_to_dict(archive_metadata.core, archive_dir),
+            "extensions": [_file_metadata_to_dict(ext, archive_dir) for ext in archive_metadata.extensions],
+        }
+        with cache_path.open("w", encoding="utf-8") as f:
+            json.dump(cached, f)
+    except (OSError, ValueError, TypeError) as e:
+        logging.warning(f"Could not write metadata cache {cache_path}: {e}")
+
+
 def parse_meta_xml(meta_path: Path) -> ArchiveMetadata:
-    """Parses meta.xml for archive metadata using dwcahandler's MetaDwCA."""
-    logging.info(f"Parsing {meta_path} for archive metadata using dwcahandler...")
+    """Parses meta.xml for archive metadata, streaming it with lxml or, failing that, via dwcahandler.
+
+    The result is cached next to meta.xml, keyed on its mtime and size, so reruns over an
+    unchanged archive skip the XML parsing entirely.
+    """
     try:
-        meta_dwca = MetaDwCA()
-        meta_dwca.read_meta_file(str(meta_path))
+        stat = meta_path.stat()
+        cache_key = [stat.st_mtime_ns, stat.st_size]
+        cache_path = meta_path.parent / META_CACHE_FILENAME
+        cached = _load_meta_cache(cache_path, cache_key)
+        if cached is not None:
+            logging.info(f"Using cached archive metadata for {meta_path}")
+            return cached
+
+        if etree is not None:
+            logging.info(f"Parsing {meta_path} for archive metadata using lxml...")
+            archive_metadata = iterparse_meta_xml(meta_path)
+        else:
+            logging.info(f"Parsing {meta_path} for archive metadata using dwcahandler...")
+            # Imported here so that dwcahandler (and pandas with it) is only loaded for the fallback.
+            from dwcahandler.dwca import MetaDwCA
+
+            from etl.patches import apply_dwcahandler_patches
+
+            apply_dwcahandler_patches()
+            meta_dwca = MetaDwCA()
+            meta_dwca.read_meta_file(str(meta_path))
 
-        if not meta_dwca.meta_elements:
-            raise ExtractionError("No metadata elements found in meta.xml.")
+            if not meta_dwca.meta_elements:
+                raise ExtractionError("No metadata elements found in meta.xml.")
 
-        return map_dwca_metadata(meta_dwca, meta_path.parent)
+            archive_metadata = map_dwca_metadata(meta_dwca, meta_path.parent)
+        _save_meta_cache(cache_path, cache_key, archive_metadata)
+        return archive_metadata
 
     except Exception as e:
         error_msg = f"An unexpected error occurred during meta parsing: {e}"
@@ -1,38 +1,257 @@
+import codecs
+import csv
+import functools
+import io
 import logging
+import os
+import re
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
 
-import dask.dataframe as dd
-from dask.diagnostics import ProgressBar  # type: ignore[attr-defined]
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 
-from etl.exceptions import LoadingError
+from etl.exceptions import ETLError, LoadingError
 
+try:
+    import liburing
+except ImportError:  # Optional dependency, only needed for load_backend: io_uring
+    liburing = None
 
-def save_dataframe_to_file(ddf: dd.DataFrame, output_path: str, sep: str = "\t", encoding: str = "utf-8") -> None:
-    """Saves a Dask DataFrame to a single file.
+WRITE_BUFFER_SIZE = 8 << 20  # 8 MiB
+URING_QUEUE_DEPTH = 32
+URING_BUFFER_SIZE = 1 << 20  # 1 MiB
+URING_SUBMIT_SIZE = 8 << 20  # 8 MiB
+URING_MIN_KERNEL = (5, 10)
+
+
+class _UringWriter:
+    """Sequential file writer that keeps up to URING_QUEUE_DEPTH writes in flight via io_uring.
+
+    Small writes are gathered until they fill URING_BUFFER_SIZE, larger ones are queued as they
+    are, each at the next file offset. Queued writes are submitted together once URING_SUBMIT_SIZE
+    bytes are waiting, so one io_uring_submit call covers several buffers. The caller only blocks
+    on a completion once the queue is full, so producing CSV bytes overlaps with the kernel
+    writing earlier buffers.
+    """
+
+    def __init__(self, output_path: str):
+        self._ring = liburing.Ring()
+        self._cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(URING_QUEUE_DEPTH, self._ring)
+        try:
+            self._fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError:
+            liburing.io_uring_queue_exit(self._ring)
+            raise
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._unsubmitted_size = 0
+        self._offset = 0
+        self._next_id = 0
+        # Queued buffers must stay referenced until their completion is reaped.
+        self._in_flight: dict[int, tuple[int, bytes]] = {}
+
+    def write(self, data: bytes) -> None:
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= URING_BUFFER_SIZE:
+            self._queue_pending()
+
+    def _queue_pending(self) -> None:
+        if not self._pending:
+            return
+        if len(self._in_flight) >= URING_QUEUE_DEPTH:
+            self._reap()
+        buffer = self._pending[0] if len(self._pending) == 1 else b"".join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        liburing.io_uring_prep_write(sqe, self._fd, buffer, self._offset)
+        liburing.io_uring_sqe_set_data64(sqe, self._next_id)
+        self._in_flight[self._next_id] = (self._offset, buffer)
+        self._offset += len(buffer)
+        self._next_id += 1
+        self._unsubmitted_size += len(buffer)
+        if self._unsubmitted_size >= URING_SUBMIT_SIZE:
+            self._submit()
+
+    def _submit(self) -> None:
+        if self._unsubmitted_size:
+            liburing.io_uring_submit(self._ring)
+            self._unsubmitted_size = 0
+
+    def _reap(self) -> None:
+        """Waits for one completion and checks it wrote the whole buffer."""
+        self._submit()
+        liburing.io_uring_wait_cqe(self._ring, self._cqe)
+        cqe = self._cqe[0]
+        result, write_id = cqe.res, cqe.user_data
+        liburing.io_uring_cqe_seen(self._ring, cqe)
+        offset, buffer = self._in_flight.pop(write_id)
+        if result < 0:
+            raise OSError(-result, os.strerror(-result))
+        while result < len(buffer):  # Short write: finish the remainder synchronously.
+            result += os.pwrite(self._fd, buffer[result:], offset + result)
+
+    def close(self) -> None:
+        try:
+            self._queue_pending()
+            while self._in_flight:
+                self._reap()
+        finally:
+            liburing.io_uring_queue_exit(self._ring)
+            os.close(self._fd)
+
+    def __enter__(self) -> "_UringWriter":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+def _kernel_version() -> tuple[int, int]:
+    """Returns the running kernel's (major, minor) version, or (0, 0) if it cannot be parsed."""
+    match = re.match(r"(\d+)\.(\d+)", os.uname().release)
+    return (int(match[1]), int(match[2])) if match else (0, 0)
+
+
+@contextmanager
+def _open_output(output_path: str, backend: str) -> Iterator[Callable[[bytes], object]]:
+    """Opens output_path for sequential writing and yields its write function."""
+    if backend == "io_uring":
+        if liburing is None:
+            logging.warning("load_backend is io_uring but liburing is not installed. Falling back to stdio.")
+        elif _kernel_version() < URING_MIN_KERNEL:
+            # Older kernels can set up a ring but lack (or have incomplete) IORING_OP_WRITE support.
+            logging.warning(
+                f"load_backend is io_uring but the kernel is older than {'.'.join(map(str, URING_MIN_KERNEL))}. "
+                "Falling back to stdio."
+            )
+        else:
+            try:
+                writer = _UringWriter(output_path)
+            except OSError as e:
+                logging.warning(f"io_uring is unavailable ({e}). Falling back to stdio.")
+            else:
+                with writer:
+                    yield writer.write
+                return
+
+    # A large buffer coalesces the header and small batches into few, large write() calls.
+    with Path(output_path).open("wb", buffering=0) as raw, io.BufferedWriter(raw, WRITE_BUFFER_SIZE) as f:
+        yield f.write
+
+
+def _format_rows(rows: list[list[str]], sep: str) -> str:
+    """Formats rows with the csv module, quoting only the fields that need it."""
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=sep, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+class _Echo:
+    """File-like object whose write returns the line, so csv.writer.writerow returns it too."""
+
+    def write(self, line: str) -> str:
+        return line
+
+
+def _needs_quoting(column: pa.Array, sep: str) -> pa.Array | None:
+    """Marks the values of a string column containing sep, quotes or newlines, or returns None if none do.
+
+    The column's data buffer is first searched in place as a single binary value, so the
+    per-value regex only runs on columns that may contain such characters.
+    """
+    special = sep + '"\n\r'
+    pattern = f"[{re.escape(special)}]"
+    data = column.buffers()[2]
+    if data is None:
+        return None
+    offsets = pa.array([0, data.size], type=pa.int64()).buffers()[1]
+    whole = pa.Array.from_buffers(pa.large_binary(), 1, [None, offsets, data])
+    if not pc.match_substring_regex(whole, pattern)[0].as_py():
+        return None
+    return pc.fill_null(pc.match_substring_regex(column, pattern), False)
+
+
+def _batch_to_csv(batch: pa.RecordBatch, sep: str) -> bytes:
+    """Serialises a record batch to UTF-8 CSV without a header line.
+
+    Arrow writes unquoted values directly, which is the common case. If some values contain
+    separators, quotes or newlines (or are empty in a one-column batch), only the rows holding
+    them are formatted by the csv module and spliced back into the Arrow-joined lines, so the
+    output keeps minimal quoting without sending whole batches through Python.
+    """
+    columns = [column.cast(pa.string()) if pa.types.is_dictionary(column.type) else column for column in batch.columns]
+    masks = [mask for column in columns if (mask := _needs_quoting(column, sep)) is not None]
+    if len(columns) == 1:
+        # A lone empty field is quoted by the csv module, otherwise the row would read back as a blank line.
+        empty = pc.fill_null(pc.equal(columns[0], ""), True)
+        if pc.any(empty).as_py():
+            masks.append(empty)
+    if not masks:
+        buffer = io.BytesIO()
+        pa_csv.write_csv(batch, buffer, pa_csv.WriteOptions(include_header=False, delimiter=sep, quoting_style="none"))
+        return buffer.getvalue()
+
+    quote = functools.reduce(pc.or_, masks)
+    # The terminator decides which characters the csv module quotes, so it is kept here and cut off below.
+    writer = csv.writer(_Echo(), delimiter=sep, lineterminator="\n")
+    rows = zip(*(column.filter(quote).to_pylist() for column in columns), strict=True)
+    quoted_lines = pa.array([writer.writerow(row)[:-1] for row in rows], type=pa.string())
+    lines = pc.binary_join_element_wise(*columns, sep, null_handling="replace")
+    lines = pc.binary_join_element_wise(pc.replace_with_mask(lines, quote, quoted_lines), "", "\n")
+    # The joined lines sit back to back in the array's data buffer, which is the CSV text itself.
+    _, offsets, data = lines.buffers()
+    positions = memoryview(offsets).cast("i")
+    start, end = positions[lines.offset], positions[lines.offset + len(lines)]
+    return bytes(data.slice(start, end - start))
+
+
+def save_batches_to_file(
+    reader: pa.RecordBatchReader,
+    output_path: str,
+    sep: str = "\t",
+    encoding: str = "utf-8",
+    backend: str = "stdio",
+) -> int:
+    """Streams record batches into a single delimited file.
 
     Args:
-        ddf: The Dask DataFrame to save.
+        reader: The record batches to save.
         output_path: The path where the file should be saved.
         sep: The separator to use in the output file.
         encoding: The encoding to use for the output file.
+        backend: How the file is written, 'stdio' (buffered writes) or 'io_uring'.
+
+    Returns:
+        The number of data rows written, counted as the batches stream through.
 
     Raises:
         LoadingError: If an error occurred during loading.
     """
     logging.info(f"Saving data to {output_path}...")
     try:
-        # We want to save the entire DataFrame as a single file.
-        # to_csv with single_file=True is only supported for some storage backends,
-        # otherwise we'd need to collapse partitions which might be memory-intensive.
-        # For local files, we can use compute() or dask's own single file handling.
-        with ProgressBar():  # type: ignore[no-untyped-call]
-            ddf.to_csv(  # type: ignore[no-untyped-call]
-                output_path,
-                sep=sep,
-                index=False,
-                encoding=encoding,
-                single_file=True,
-            )
+        passthrough = codecs.lookup(encoding).name == "utf-8"
+        encoder = codecs.getincrementalencoder(encoding)()
+        row_count = 0
+        with _open_output(output_path, backend) as write:
+            write(encoder.encode(_format_rows([reader.schema.names], sep)))
+            for batch in reader:
+                data = _batch_to_csv(batch, sep)
+                write(data if passthrough else encoder.encode(data.decode("utf-8")))
+                row_count += batch.num_rows
+            write(encoder.encode("", final=True))
         logging.info(f"Successfully created: {output_path}")
+        return row_count
+    except ETLError:
+        raise
     except Exception as e:
         error_msg = f"An unexpected error occurred during loading: {e}"
         logging.error(error_msg)
@@ -1,6 +1,24 @@
 import logging
+from typing import Any
 
-from pythonjsonlogger import jsonlogger
+import orjson
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as a single JSON object, serialised with orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record: dict[str, Any] = {
+            "asctime": self.formatTime(record),
+            "name": record.name,
+            "levelname": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            log_record["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(log_record, default=str).decode()
 
 
 def setup_logging(log_level: str = "INFO", log_format: str = "text") -> None:
@@ -12,7 +30,7 @@ def setup_logging(log_level: str = "INFO", log_format: str = "text") -> None:
 
     formatter: logging.Formatter
     if log_format.lower() == "json":
-        formatter = jsonlogger.JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")  # type: ignore[attr-defined]
+        formatter = JsonFormatter()
     else:
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 
@@ -1,11 +1,11 @@
 import logging
 from typing import Any
 
-from dwcahandler.dwca import MetaDwCA
-
 
 def apply_dwcahandler_patches() -> None:
     """Applies runtime patches to dwcahandler to improve robustness."""
+    from dwcahandler.dwca import MetaDwCA
+
     _original_extract_meta_info = MetaDwCA._MetaDwCA__extract_meta_info
 
     def _patched_extract_meta_info(self: Any, ns: str, node_elm: Any, core_or_ext_type: Any) -> Any:
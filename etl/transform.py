@@ -1,10 +1,180 @@
+import csv
 import logging
+import threading
+from collections.abc import Iterator
 
-import dask.dataframe as dd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import xxhash
 
 from etl.exceptions import TransformationError
 from etl.extract import FieldMetadata, FileMetadata
 
+READ_BLOCK_SIZE = 64 << 20  # 64 MiB
+DEDUP_KEY_SEPARATOR = "\x1f"  # ASCII unit separator, joins the key columns before hashing
+CATEGORICAL_TYPE = pa.dictionary(pa.int32(), pa.string())
+MAX_BAD_LINE_WARNINGS = 10
+
+
+class _BadLineHandler:
+    """Arrow invalid row handler implementing the on_bad_lines option ('warn', 'error', 'skip').
+
+    Arrow validates rows in C++ and only calls back into Python for rows with the wrong number
+    of fields. As with pandas, rows with too few fields are kept and padded with empty fields;
+    Arrow can only skip a row, so their text is held and re-parsed by pad_short_rows. Rows with
+    too many fields follow on_bad_lines. With 'warn', only the first MAX_BAD_LINE_WARNINGS rows
+    are logged individually and the rest are counted, so archives with many malformed rows don't
+    spend their time logging. Warnings are held until log_warnings is called for a consumed
+    batch, so a reader that is opened and discarded leaves nothing in the log.
+    """
+
+    def __init__(self, on_bad_lines: str, delimiter: str):
+        self.on_bad_lines = on_bad_lines
+        self.delimiter = delimiter
+        self.skipped = 0
+        self._warnings: list[str] = []
+        self._short_rows: list[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, row: pa_csv.InvalidRow) -> str:
+        if row.actual_columns < row.expected_columns:
+            with self._lock:
+                self._short_rows.append(row.text)
+            return "skip"
+        if self.on_bad_lines == "error":
+            return "error"
+        with self._lock:
+            self.skipped += 1
+            if self.on_bad_lines == "warn" and self.skipped <= MAX_BAD_LINE_WARNINGS:
+                self._warnings.append(
+                    f"Skipping line {row.number}: expected {row.expected_columns} fields, saw {row.actual_columns}"
+                )
+        return "skip"
+
+    def log_warnings(self) -> None:
+        with self._lock:
+            warnings, self._warnings = self._warnings, []
+        for warning in warnings:
+            logging.warning(warning)
+
+    def pad_short_rows(self, schema: pa.Schema) -> pa.RecordBatch | None:
+        """Returns the short rows held so far as one batch of schema, padded with empty fields."""
+        with self._lock:
+            texts, self._short_rows = self._short_rows, []
+        if not texts:
+            return None
+        rows = [next(csv.reader([text], delimiter=self.delimiter), []) for text in texts]
+        columns = [
+            pa.array([row[i] if i < len(row) else "" for row in rows], type=pa.string()) for i in range(len(schema))
+        ]
+        return pa.record_batch(columns, names=schema.names).cast(schema)
+
+    def log_summary(self, files: list[str]) -> None:
+        if self.on_bad_lines == "warn" and self.skipped > MAX_BAD_LINE_WARNINGS:
+            logging.warning(
+                f"Skipped {self.skipped} lines with too many fields in {len(files)} files; only the first "
+                f"{MAX_BAD_LINE_WARNINGS} were logged individually."
+            )
+
+
+def _parse_options(delimiter: str, bad_lines: _BadLineHandler) -> pa_csv.ParseOptions:
+    """Parses delimited rows that may contain quoted newlines, passing malformed rows to bad_lines."""
+    return pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True, invalid_row_handler=bad_lines)
+
+
+def _convert_options(column_types: dict[str, pa.DataType]) -> pa_csv.ConvertOptions:
+    """Reads columns as non-null strings (plain or dictionary-encoded), keeping empty fields as empty strings."""
+    return pa_csv.ConvertOptions(
+        column_types=column_types,
+        null_values=[],
+        strings_can_be_null=False,
+        quoted_strings_can_be_null=False,
+    )
+
+
+def _read_batches(
+    files: list[str],
+    first_reader: pa_csv.CSVStreamingReader,
+    read_options: pa_csv.ReadOptions,
+    parse_options: pa_csv.ParseOptions,
+    convert_options: pa_csv.ConvertOptions,
+    bad_lines: _BadLineHandler,
+) -> Iterator[pa.RecordBatch]:
+    """Streams record batches from every file in turn, starting with the already opened first one."""
+    schema = first_reader.schema
+    with first_reader:
+        yield from _with_bad_lines(first_reader, bad_lines)
+
+    for file in files[1:]:
+        with pa_csv.open_csv(
+            file, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        ) as reader:
+            if reader.schema != schema:
+                raise TransformationError(
+                    f"{file} has {len(reader.schema)} columns, expected {len(schema)} like {files[0]}."
+                )
+            yield from _with_bad_lines(reader, bad_lines)
+
+    bad_lines.log_summary(files)
+
+
+def _with_bad_lines(reader: pa_csv.CSVStreamingReader, bad_lines: _BadLineHandler) -> Iterator[pa.RecordBatch]:
+    """Yields the reader's batches, each followed by the padded short rows Arrow skipped while reading it.
+
+    The handler runs while a block is parsed, before its batch is returned. Arrow does not say
+    where in the block a skipped row was, so short rows follow the well-formed rows of their block.
+    """
+    for batch in reader:
+        bad_lines.log_warnings()
+        yield batch
+        if (padded := bad_lines.pad_short_rows(reader.schema)) is not None:
+            yield padded
+
+
+def _new_row_mask(batch: pa.RecordBatch, key_indices: list[int], seen: set[int]) -> pa.Array:
+    """Marks the rows whose key has not been seen before, recording their keys in seen.
+
+    Only a 128-bit xxh3 digest of each key is remembered, so memory grows with the number of
+    distinct rows rather than their width, and no shuffle or sort is needed.
+    """
+    key_columns = (batch.column(i) for i in key_indices)
+    keys = pc.binary_join_element_wise(
+        *(c.cast(pa.string()) if pa.types.is_dictionary(c.type) else c for c in key_columns),
+        DEDUP_KEY_SEPARATOR,
+        null_handling="replace",
+    )
+    digest = xxhash.xxh3_128_intdigest
+    mask = []
+    for key in keys.cast(pa.binary()).to_pylist():
+        seen_count = len(seen)
+        seen.add(digest(key))
+        mask.append(len(seen) != seen_count)
+    return pa.array(mask, type=pa.bool_())
+
+
+def _transform_batches(
+    batches: Iterator[pa.RecordBatch],
+    key_indices: list[int],
+    names: list[str],
+    fill_defaults: dict[int, str],
+    append_defaults: list[str],
+) -> Iterator[pa.RecordBatch]:
+    """Deduplicates, fills defaults and renames each batch in a single pass.
+
+    Duplicates are dropped first (keeping the first occurrence across the whole stream), so the
+    remaining steps only touch surviving rows, and the output batch is assembled once.
+    """
+    seen: set[int] = set()
+    for batch in batches:
+        mask = _new_row_mask(batch, key_indices, seen)
+        columns = [column.filter(mask) for column in batch.columns]
+        row_count = len(columns[0])
+        for i, default in fill_defaults.items():
+            columns[i] = pc.fill_null(columns[i], default)
+        columns.extend(pa.array([default] * row_count, type=pa.string()) for default in append_defaults)
+        yield pa.RecordBatch.from_arrays(columns, names=names)
+
 
 def transform_extension_data(
     files: list[str],
@@ -14,10 +184,12 @@ def transform_extension_data(
     read_encoding: str = "utf-8",
     on_bad_lines: str = "warn",
     deduplicate_columns: list[str] | None = None,
-) -> dd.DataFrame:
-    """Transforms a list of files into a single Dask DataFrame.
+    categorical_columns: list[str] | None = None,
+) -> pa.RecordBatchReader:
+    """Transforms a list of files into a single stream of Arrow record batches.
 
-    This includes reading, deduplicating, and mapping headers in a memory-efficient way.
+    This includes reading, deduplicating, and mapping headers. Nothing is read beyond the
+    first block until the returned reader is consumed, so memory stays bounded by the block size.
 
     Args:
         files: A list of file paths to process.
@@ -26,61 +198,100 @@ def transform_extension_data(
         default_fields_metadata: Fields to inject with default values if missing.
         read_encoding: The encoding for reading CSV files.
         on_bad_lines: Strategy for malformed CSV lines ('warn', 'error', 'skip').
-        deduplicate_columns: Columns to consider for drop_duplicates. If None, all columns are used.
+        deduplicate_columns: Columns to consider for deduplication. If None, all columns are used.
+        categorical_columns: Columns with few distinct values, kept dictionary-encoded in memory.
 
     Returns:
-        A partitioned Dask DataFrame.
+        A record batch reader yielding the transformed rows, all columns typed as (dictionary) strings.
     """
-    logging.info(f"Transforming {len(files)} files using Dask...")
+    logging.info(f"Transforming {len(files)} files using PyArrow...")
     try:
         if not files:
             error_msg = "No files to transform."
             logging.error(error_msg)
             raise TransformationError(error_msg)
 
-        # Dask reads files in parallel chunks.
-        ddf = dd.read_csv(
-            files,
-            header=None,
-            dtype=str,
-            na_values=[],
-            keep_default_na=False,
-            blocksize=None,
+        delimiter = file_metadata.fields_terminated_by.replace("\\t", "\t")
+        bad_lines = _BadLineHandler(on_bad_lines, delimiter)
+        read_options = pa_csv.ReadOptions(
+            use_threads=True,
+            block_size=READ_BLOCK_SIZE,
+            skip_rows=file_metadata.ignore_header_lines,
+            autogenerate_column_names=True,
             encoding=read_encoding,
-            on_bad_lines=on_bad_lines,
-            sep=file_metadata.fields_terminated_by.replace("\\t", "\t"),
-            skiprows=file_metadata.ignore_header_lines,
         )
+        parse_options = _parse_options(delimiter, bad_lines)
+
+        # Columns are named f0, f1, ... by Arrow; guess the count from the header and reopen
+        # only if the data is wider, since extra columns would otherwise get inferred types.
+        categorical = set(categorical_columns or [])
+        column_types = {
+            f"f{i}": CATEGORICAL_TYPE if name in categorical else pa.string() for i, name in enumerate(indexed_header)
+        }
+        convert_options = _convert_options(column_types)
+        reader = pa_csv.open_csv(
+            files[0], read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        )
+        if any(name not in column_types for name in reader.schema.names):
+            reader.close()
+            # The first block is parsed again below; a fresh handler keeps it from being counted twice.
+            bad_lines = _BadLineHandler(on_bad_lines, delimiter)
+            parse_options = _parse_options(delimiter, bad_lines)
+            # The header does not describe this data, so it cannot say which columns are categorical.
+            convert_options = _convert_options({name: pa.string() for name in reader.schema.names})
+            reader = pa_csv.open_csv(
+                files[0], read_options=read_options, parse_options=parse_options, convert_options=convert_options
+            )
 
-        if ddf is None or len(ddf.columns) == 0:
+        column_count = len(reader.schema)
+        if column_count == 0:
             error_msg = "No data read from files. Skipping."
             logging.error(error_msg)
             raise TransformationError(error_msg)
 
-        # Deduplicate across the entire dataset.
-        ddf = ddf.drop_duplicates(subset=deduplicate_columns if deduplicate_columns else None)
-
-        if indexed_header and len(ddf.columns) == len(indexed_header):
-            ddf.columns = indexed_header
+        if indexed_header and column_count == len(indexed_header):
+            names = list(indexed_header)
         else:
             logging.warning(
                 "Header length (%d) does not match number of columns (%d). Columns will not be renamed.",
                 len(indexed_header),
-                len(ddf.columns),
+                column_count,
             )
+            names = [str(i) for i in range(column_count)]
+
+        if deduplicate_columns:
+            missing = [name for name in deduplicate_columns if name not in names]
+            if missing:
+                raise TransformationError(f"Deduplication columns not found: {missing}")
+            key_indices = [names.index(name) for name in deduplicate_columns]
+        else:
+            key_indices = list(range(column_count))
 
-        # Inject default values for missing columns
+        fill_defaults: dict[int, str] = {}
+        append_defaults: dict[str, str] = {}
         for field in default_fields_metadata:
-            if field.name is not None:
-                if field.name not in ddf.columns:
-                    ddf[field.name] = field.default
-                else:
-                    ddf[field.name] = ddf[field.name].fillna(field.default)
+            if field.name is None or field.default is None:
+                continue
+            if field.name in names:
+                fill_defaults[names.index(field.name)] = field.default
+            else:
+                append_defaults[field.name] = field.default
+        output_names = names + list(append_defaults)
+        output_types = reader.schema.types + [pa.string()] * len(append_defaults)
+
+        batches = _transform_batches(
+            _read_batches(files, reader, read_options, parse_options, convert_options, bad_lines),
+            key_indices,
+            output_names,
+            fill_defaults,
+            list(append_defaults.values()),
+        )
 
-        return ddf  # type: ignore[no-any-return]
+        schema = pa.schema([pa.field(name, type_) for name, type_ in zip(output_names, output_types, strict=True)])
+        return pa.RecordBatchReader.from_batches(schema, batches)
     except TransformationError:
         raise
     except Exception as e:
-        error_msg = f"An unexpected error occurred during Dask transformation: {e}"
+        error_msg = f"An unexpected error occurred during Arrow transformation: {e}"
         logging.error(error_msg)
         raise TransformationError(error_msg) from e
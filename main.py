@@ -1,7 +1,10 @@
 import argparse
+import fnmatch
 import logging
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
@@ -11,9 +14,8 @@ from tqdm import tqdm
 from etl.config_schema import ProjectConfig
 from etl.exceptions import ETLError
 from etl.extract import FileMetadata, download_data, extract_archive, parse_meta_xml
-from etl.load import save_dataframe_to_file
+from etl.load import save_batches_to_file
 from etl.logging_config import setup_logging
-from etl.patches import apply_dwcahandler_patches
 from etl.transform import transform_extension_data
 
 
@@ -61,6 +63,16 @@ class ETLPipeline:
         extract_archive(self.config.zip_path, self.config.extract_dir)
         logging.info(f"Unzip phase completed in {time.time() - start_time:.2f} seconds")
 
+    def _is_extracted(self) -> bool:
+        """Whether extract_dir holds an extraction at least as new as the archive zip."""
+        meta_path = self.config.extract_dir / "meta.xml"
+        return meta_path.exists() and meta_path.stat().st_mtime >= self.config.zip_path.stat().st_mtime
+
+    def _list_extracted_files(self) -> list[str]:
+        """Lists the files in extract_dir once, so per-file lookups don't rescan the directory."""
+        with os.scandir(self.config.extract_dir) as entries:
+            return sorted(entry.name for entry in entries if entry.is_file())
+
     def _run_processing_phase(self) -> None:
         """Parses metadata and processes core/extension files."""
         meta_path = self.config.extract_dir / "meta.xml"
@@ -71,9 +83,32 @@ class ETLPipeline:
         core_id_column = self._determine_core_id_column(archive_metadata)
         files_to_process = [archive_metadata.core] + archive_metadata.extensions
 
+        # Resolve every output path before any writer starts, so parallel writers never share a file.
+        output_paths = [
+            self.config.output_dir / f"{file_metadata.file_path.stem}{self.config.output_extension}"
+            for file_metadata in files_to_process
+        ]
+        if len(set(output_paths)) != len(output_paths):
+            raise ETLError("Several archive files map to the same output file; they would overwrite each other.")
+
+        extracted_files = self._list_extracted_files()
+
         total_start_time = time.time()
-        for file_metadata in tqdm(files_to_process, desc="Processing DWCA files"):
-            self._process_file(file_metadata, core_id_column)
+        # Files are independent, and Arrow releases the GIL while parsing and writing,
+        # so a thread pool lets the core and extension files overlap.
+        max_workers = min(len(files_to_process), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dwca-file") as executor:
+            futures = [
+                executor.submit(self._process_file, file_metadata, core_id_column, output_path, extracted_files)
+                for file_metadata, output_path in zip(files_to_process, output_paths, strict=True)
+            ]
+            try:
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Processing DWCA files"):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
 
         logging.info(
             f"All files processed in {time.time() - total_start_time:.2f} seconds. "
@@ -83,7 +118,6 @@ class ETLPipeline:
     def run(self, mode: str = "all") -> None:
         """Executes the ETL pipeline for the selected mode."""
         try:
-            apply_dwcahandler_patches()
             self._prepare_directories()
 
             if mode in ("all", "download"):
@@ -94,7 +128,13 @@ class ETLPipeline:
 
             if mode in ("all", "process"):
                 if mode == "process":
-                    if self.config.zip_path.exists():
+                    if self.config.zip_path.exists() and self._is_extracted():
+                        logging.info(
+                            "Process mode: %s is already extracted into %s; skipping extraction",
+                            self.config.zip_path,
+                            self.config.extract_dir,
+                        )
+                    elif self.config.zip_path.exists():
                         logging.info(
                             "Process mode: archive %s found; extracting into %s before processing",
                             self.config.zip_path,
@@ -116,7 +156,13 @@ class ETLPipeline:
             logging.critical(f"An unexpected error occurred: {e}")
             sys.exit(1)
 
-    def _process_file(self, file_metadata: FileMetadata, core_id_column: str | None) -> None:
+    def _process_file(
+        self,
+        file_metadata: FileMetadata,
+        core_id_column: str | None,
+        output_path: Path,
+        extracted_files: list[str],
+    ) -> None:
         """Processes a single Darwin Core file (core or extension)."""
         basename = file_metadata.file_path.name
         logging.info("Processing file: %s", basename)
@@ -126,13 +172,13 @@ class ETLPipeline:
 
         # Collect all chunks matching the file pattern
         pattern = f"{file_metadata.file_path.stem}*{file_metadata.file_path.suffix}"
-        files = [str(f) for f in self.config.extract_dir.glob(pattern)]
+        files = [str(self.config.extract_dir / name) for name in fnmatch.filter(extracted_files, pattern)]
 
         if not files:
             logging.warning(f"No files found for {basename} matching {pattern}. Skipping.")
             return
 
-        df = transform_extension_data(
+        batches = transform_extension_data(
             files,
             file_metadata,
             indexed_header,
@@ -140,13 +186,15 @@ class ETLPipeline:
             read_encoding=self.config.read_encoding,
             on_bad_lines=self.config.on_bad_lines,
             deduplicate_columns=self.config.deduplicate_columns,
+            categorical_columns=self.config.categorical_columns,
         )
 
-        row_count = len(df)
-        output_path = self.config.output_dir / f"{file_metadata.file_path.stem}{self.config.output_extension}"
-
-        save_dataframe_to_file(
-            df, str(output_path), sep=self.config.output_separator, encoding=self.config.write_encoding
+        row_count = save_batches_to_file(
+            batches,
+            str(output_path),
+            sep=self.config.output_separator,
+            encoding=self.config.write_encoding,
+            backend=self.config.load_backend,
         )
 
         logging.info(f"Processed {row_count} rows from {basename} in {time.time() - start_time:.2f} seconds")
@@ -1,11 +1,25 @@
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
 from typing import Any
 
-from etl.extract import ArchiveMetadata, FieldMetadata, parse_meta_xml
+import requests
 
+from etl.extract import (
+    ArchiveMetadata,
+    FieldMetadata,
+    FileMetadata,
+    download_data,
+    extract_archive,
+    parse_meta_xml,
+)
 
-def test_parse_meta_xml_simple(tmp_path: Any, mocker: Any) -> None:
-    # Mock MetaDwCA
-    mock_meta_dwca = mocker.patch("etl.extract.MetaDwCA", autospec=True)
+
+def _mock_meta_dwca(mocker: Any) -> Any:
+    # Force the dwcahandler fallback and mock MetaDwCA
+    mocker.patch("etl.extract.etree", None)
+    mock_meta_dwca = mocker.patch("dwcahandler.dwca.MetaDwCA", autospec=True)
     mock_instance = mock_meta_dwca.return_value
 
     # Simulate meta_elements from dwcahandler
@@ -39,6 +53,11 @@ def test_parse_meta_xml_simple(tmp_path: Any, mocker: Any) -> None:
     mock_element.core_id.index = "0"
 
     mock_instance.meta_elements = [mock_element]
+    return mock_meta_dwca
+
+
+def test_parse_meta_xml_simple(tmp_path: Any, mocker: Any) -> None:
+    _mock_meta_dwca(mocker)
 
     # Create dummy meta.xml path
     meta_path = tmp_path / "meta.xml"
@@ -53,6 +72,87 @@ def test_parse_meta_xml_simple(tmp_path: Any, mocker: Any) -> None:
     assert result.core.id_index == 0
 
 
+def test_parse_meta_xml_uses_cache_for_unchanged_file(tmp_path: Any, mocker: Any) -> None:
+    mock_meta_dwca = _mock_meta_dwca(mocker)
+
+    meta_path = tmp_path / "meta.xml"
+    meta_path.touch()
+
+    first = parse_meta_xml(meta_path)
+    second = parse_meta_xml(meta_path)
+
+    assert mock_meta_dwca.call_count == 1
+    assert second == first
+
+    # A rewritten meta.xml invalidates the cache.
+    meta_path.write_text("<archive/>")
+    parse_meta_xml(meta_path)
+    assert mock_meta_dwca.call_count == 2
+
+
+META_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<archive xmlns="http://rs.tdwg.org/dwc/text/" metadata="eml.xml">
+  <core encoding="UTF-8" fieldsTerminatedBy="\\t" linesTerminatedBy="\\n" fieldsEnclosedBy=""
+        ignoreHeaderLines="1" rowType="http://rs.tdwg.org/dwc/terms/Occurrence">
+    <files><location> occurrence.txt </location></files>
+    <id index="0"/>
+    <field index="0" term="http://rs.tdwg.org/dwc/terms/occurrenceID"/>
+    <field index="1" term="http://rs.tdwg.org/dwc/terms/scientificName"/>
+    <field default="PreservedSpecimen" term="http://rs.tdwg.org/dwc/terms/basisOfRecord"/>
+  </core>
+  <extension encoding="UTF-8" linesTerminatedBy="\\n" rowType="http://rs.gbif.org/terms/1.0/Multimedia">
+    <files><location>multimedia.txt</location></files>
+    <coreid index="0"/>
+    <field index="1" term="http://purl.org/dc/terms/identifier"/>
+  </extension>
+</archive>
+"""
+
+
+def test_parse_meta_xml_with_lxml_matches_dwcahandler(tmp_path: Any, mocker: Any) -> None:
+    meta_path = tmp_path / "meta.xml"
+    meta_path.write_text(META_XML)
+
+    result = parse_meta_xml(meta_path)
+
+    assert result.core.file_path == tmp_path / "occurrence.txt"
+    assert result.core.fields_terminated_by == "\t"
+    assert result.core.ignore_header_lines == 1
+    assert result.core.id_index == 0
+    assert [(f.index, f.name, f.default) for f in result.core.fields] == [
+        (0, "occurrenceID", None),
+        (1, "scientificName", None),
+        (None, "basisOfRecord", "PreservedSpecimen"),
+    ]
+    (extension,) = result.extensions
+    assert extension.file_path == tmp_path / "multimedia.txt"
+    assert extension.fields_terminated_by == ","
+    assert extension.ignore_header_lines == 0
+    assert extension.coreid_index == 0
+    assert extension.id_index is None
+
+    # The dwcahandler fallback reads the same archive identically.
+    mocker.patch("etl.extract.etree", None)
+    (tmp_path / ".meta_cache.json").unlink()
+    assert parse_meta_xml(meta_path) == result
+
+
+def test_parse_meta_xml_caches_absolute_locations(tmp_path: Any) -> None:
+    meta_path = tmp_path / "meta.xml"
+    meta_path.write_text(META_XML.replace("multimedia.txt", "/srv/data/multimedia.txt"))
+
+    result = parse_meta_xml(meta_path)
+
+    assert result.extensions[0].file_path == Path("/srv/data/multimedia.txt")
+    assert (tmp_path / ".meta_cache.json").exists()
+    assert parse_meta_xml(meta_path) == result
+
+
+def test_importing_extract_does_not_load_dwcahandler() -> None:
+    code = "import sys, etl.extract; sys.exit('dwcahandler' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+
 def test_field_metadata_naming() -> None:
     field = FieldMetadata(index=0, term="http://rs.tdwg.org/dwc/terms/occurrenceID", default="defaultVal")
     assert field.name == "occurrenceID"
@@ -60,3 +160,83 @@ def test_field_metadata_naming() -> None:
     # Test fallback name from URI
     field_uri = FieldMetadata(index=1, term="http://rs.tdwg.org/dwc/terms/eventDate")
     assert field_uri.name == "eventDate"
+
+
+def test_get_header_maps_indices_and_defaults() -> None:
+    fields = [
+        FieldMetadata(index=0, term="http://rs.tdwg.org/dwc/terms/occurrenceID"),
+        FieldMetadata(index=3, term="http://rs.tdwg.org/dwc/terms/eventDate"),
+        FieldMetadata(index=None, term="http://rs.tdwg.org/dwc/terms/basisOfRecord", default="PreservedSpecimen"),
+        FieldMetadata(index=None, term="http://rs.tdwg.org/dwc/terms/country"),
+    ]
+    extension = FileMetadata(
+        file_path=Path("multimedia.txt"),
+        row_type="http://rs.gbif.org/terms/1.0/Multimedia",
+        fields=tuple(fields),
+        fields_terminated_by="\\t",
+        ignore_header_lines=1,
+        coreid_index=1,
+    )
+
+    header, defaults = extension.get_header(core_id_column_name="catalogNumber")
+
+    assert header == ["occurrenceID", "catalogNumber", "", "eventDate"]
+    assert [f.name for f in defaults] == ["basisOfRecord"]
+
+    # The header is memoized; callers get their own copies to mutate.
+    header.append("mutated")
+    assert extension.get_header(core_id_column_name="catalogNumber")[0] == [
+        "occurrenceID",
+        "catalogNumber",
+        "",
+        "eventDate",
+    ]
+
+
+def test_download_data_writes_all_chunks(tmp_path: Any, mocker: Any) -> None:
+    mock_session = mocker.patch("etl.extract.requests.Session").return_value.__enter__.return_value
+    mock_response = mock_session.get.return_value.__enter__.return_value
+    mock_response.iter_content.return_value = [b"PK", b"\x03\x04", b"payload"]
+
+    dest = tmp_path / "archive.zip"
+    download_data("http://example.com/data.zip", dest, retries=1)
+
+    assert dest.read_bytes() == b"PK\x03\x04payload"
+    mock_response.raise_for_status.assert_called_once()
+
+
+def test_download_data_retries_on_the_same_session(tmp_path: Any, mocker: Any) -> None:
+    mock_session_cls = mocker.patch("etl.extract.requests.Session")
+    mock_session = mock_session_cls.return_value.__enter__.return_value
+    mock_response = mocker.MagicMock()
+    mock_response.__enter__.return_value.iter_content.return_value = [b"data"]
+    mock_session.get.side_effect = [requests.exceptions.ConnectionError("reset"), mock_response]
+    mock_sleep = mocker.patch("etl.extract.time.sleep")
+
+    dest = tmp_path / "archive.zip"
+    download_data("http://example.com/data.zip", dest, retries=2, backoff_factor=0.3)
+
+    assert dest.read_bytes() == b"data"
+    assert mock_session_cls.call_count == 1
+    assert mock_session.get.call_count == 2
+    assert 0 <= mock_sleep.call_args.args[0] <= 0.3
+
+
+def test_extract_archive_extracts_all_members(tmp_path: Any) -> None:
+    zip_path = tmp_path / "archive.zip"
+    contents = {
+        "meta.xml": "<archive/>",
+        "occurrence.txt": "id\tscientificName\n" * 1000,
+        "multimedia.txt": "coreid\tidentifier\n" * 100,
+        "extra/notes.txt": "notes",
+    }
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("extra/", "")
+        for name, data in contents.items():
+            zf.writestr(name, data)
+
+    out_dir = tmp_path / "extracted"
+    extract_archive(zip_path, out_dir)
+
+    for name, data in contents.items():
+        assert (out_dir / name).read_text() == data
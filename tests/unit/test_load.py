@@ -0,0 +1,84 @@
+import logging
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from etl import load
+from etl.load import URING_BUFFER_SIZE, save_batches_to_file
+
+
+def _reader(batches: list[pa.RecordBatch]) -> pa.RecordBatchReader:
+    return pa.RecordBatchReader.from_batches(batches[0].schema, iter(batches))
+
+
+def _batches() -> list[pa.RecordBatch]:
+    names = ["occurrenceID", "locality"]
+    plain = pa.record_batch([pa.array(["1", "2"]), pa.array(["Stockholm", "Uppsala"])], names=names)
+    special = pa.record_batch([pa.array(["3"]), pa.array(['Abisko\t"north"'])], names=names)
+    return [plain, special]
+
+
+def test_save_batches_quotes_only_when_needed(tmp_path: Path) -> None:
+    output_path = tmp_path / "occurrence.txt"
+    row_count = save_batches_to_file(_reader(_batches()), str(output_path))
+
+    assert row_count == 3
+    assert output_path.read_text() == 'occurrenceID\tlocality\n1\tStockholm\n2\tUppsala\n3\t"Abisko\t""north"""\n'
+
+
+def test_save_batches_quotes_rows_inside_a_batch(tmp_path: Path) -> None:
+    output_path = tmp_path / "occurrence.txt"
+    localities = pa.array(["Stockholm", 'Abisko\t"north"', "Uppsala", "Lund\nSkåne"]).dictionary_encode()
+    batch = pa.record_batch([pa.array(["1", "2", "3", "4"]), localities], names=["occurrenceID", "locality"])
+    save_batches_to_file(_reader([batch]), str(output_path))
+
+    assert output_path.read_text() == (
+        'occurrenceID\tlocality\n1\tStockholm\n2\t"Abisko\t""north"""\n3\tUppsala\n4\t"Lund\nSkåne"\n'
+    )
+
+
+def test_save_batches_quotes_empty_values_in_a_single_column(tmp_path: Path) -> None:
+    output_path = tmp_path / "occurrence.txt"
+    batch = pa.record_batch([pa.array(["1", "", None, "4"])], names=["occurrenceID"])
+    save_batches_to_file(_reader([batch]), str(output_path))
+
+    assert output_path.read_text() == 'occurrenceID\n1\n""\n""\n4\n'
+
+
+def test_save_batches_reencodes_output(tmp_path: Path) -> None:
+    output_path = tmp_path / "occurrence.txt"
+    batch = pa.record_batch([pa.array(["Göteborg"])], names=["locality"])
+    save_batches_to_file(_reader([batch]), str(output_path), encoding="latin-1")
+
+    assert output_path.read_bytes() == "locality\nGöteborg\n".encode("latin-1")
+
+
+def test_save_batches_io_uring_matches_stdio(tmp_path: Path) -> None:
+    pytest.importorskip("liburing")
+    # Enough rows to fill several io_uring buffers.
+    localities = pa.array([f"locality-{i}" for i in range(URING_BUFFER_SIZE // 4)])
+    ids = pa.array([str(i) for i in range(len(localities))])
+    # Many small batches as well, gathered into shared buffers and submitted together.
+    batches = [pa.record_batch([ids, localities], names=["occurrenceID", "locality"]), *_batches() * 2_000]
+
+    stdio_path = tmp_path / "stdio.txt"
+    uring_path = tmp_path / "uring.txt"
+    save_batches_to_file(_reader(batches), str(stdio_path))
+    save_batches_to_file(_reader(batches), str(uring_path), backend="io_uring")
+
+    assert uring_path.read_bytes() == stdio_path.read_bytes()
+
+
+def test_save_batches_io_uring_falls_back_on_old_kernels(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    pytest.importorskip("liburing")
+    monkeypatch.setattr(load, "_kernel_version", lambda: (5, 4))
+    output_path = tmp_path / "occurrence.txt"
+
+    with caplog.at_level(logging.WARNING):
+        save_batches_to_file(_reader(_batches()), str(output_path), backend="io_uring")
+
+    assert "Falling back to stdio" in caplog.text
+    assert output_path.read_text() == 'occurrenceID\tlocality\n1\tStockholm\n2\tUppsala\n3\t"Abisko\t""north"""\n'
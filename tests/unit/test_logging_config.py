@@ -0,0 +1,29 @@
+import logging
+import sys
+
+import orjson
+
+from etl.logging_config import JsonFormatter
+
+
+def test_json_formatter_emits_one_json_object() -> None:
+    record = logging.LogRecord("etl", logging.WARNING, __file__, 1, "Skipped %d rows", (3,), None)
+
+    payload = orjson.loads(JsonFormatter().format(record))
+
+    assert payload["name"] == "etl"
+    assert payload["levelname"] == "WARNING"
+    assert payload["message"] == "Skipped 3 rows"
+    assert "asctime" in payload
+    assert "exc_info" not in payload
+
+
+def test_json_formatter_includes_exception() -> None:
+    try:
+        raise ValueError("bad row")
+    except ValueError:
+        record = logging.LogRecord("etl", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+
+    payload = orjson.loads(JsonFormatter().format(record))
+
+    assert "ValueError: bad row" in payload["exc_info"]
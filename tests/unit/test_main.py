@@ -0,0 +1,106 @@
+import os
+import zipfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from etl.config_schema import ProjectConfig
+from etl.exceptions import ETLError
+from etl.extract import ArchiveMetadata, FieldMetadata, FileMetadata
+from main import ETLPipeline
+
+
+def _pipeline(tmp_path: Path) -> ETLPipeline:
+    raw_config: dict[str, Any] = {
+        "zip_path": tmp_path / "archive.zip",
+        "extract_dir": tmp_path / "extracted",
+        "output_dir": tmp_path / "output",
+        "url": "http://example.com/archive.zip",
+    }
+    config = ProjectConfig(**raw_config)
+    config.extract_dir.mkdir()
+    return ETLPipeline(config)
+
+
+def _write_archive(pipeline: ETLPipeline, zip_mtime: int, meta_mtime: int) -> None:
+    with zipfile.ZipFile(pipeline.config.zip_path, "w") as archive:
+        archive.writestr("meta.xml", "<archive/>")
+    os.utime(pipeline.config.zip_path, (zip_mtime, zip_mtime))
+    meta_path = pipeline.config.extract_dir / "meta.xml"
+    meta_path.write_text("<archive/>")
+    os.utime(meta_path, (meta_mtime, meta_mtime))
+
+
+@pytest.mark.parametrize(
+    ("zip_mtime", "meta_mtime", "extracts"),
+    [
+        (1_000, 2_000, False),  # meta.xml is newer: the archive is already extracted.
+        (2_000, 1_000, True),  # The zip is newer: extract it again.
+    ],
+)
+def test_process_mode_extracts_only_when_the_archive_changed(
+    tmp_path: Path, mocker: Any, zip_mtime: int, meta_mtime: int, extracts: bool
+) -> None:
+    pipeline = _pipeline(tmp_path)
+    _write_archive(pipeline, zip_mtime, meta_mtime)
+    unzip = mocker.patch.object(pipeline, "_run_unzip_phase")
+    process = mocker.patch.object(pipeline, "_run_processing_phase")
+
+    pipeline.run(mode="process")
+
+    assert unzip.called == extracts
+    process.assert_called_once()
+
+
+def test_process_mode_without_archive_processes_extracted_files(tmp_path: Path, mocker: Any) -> None:
+    pipeline = _pipeline(tmp_path)
+    (pipeline.config.extract_dir / "meta.xml").write_text("<archive/>")
+    unzip = mocker.patch.object(pipeline, "_run_unzip_phase")
+    process = mocker.patch.object(pipeline, "_run_processing_phase")
+
+    pipeline.run(mode="process")
+
+    unzip.assert_not_called()
+    process.assert_called_once()
+
+
+def _occurrence_metadata(file_path: Path) -> FileMetadata:
+    return FileMetadata(
+        file_path=file_path,
+        row_type="http://rs.tdwg.org/dwc/terms/Occurrence",
+        fields=(
+            FieldMetadata(index=0, term="http://rs.tdwg.org/dwc/terms/occurrenceID"),
+            FieldMetadata(index=1, term="http://rs.tdwg.org/dwc/terms/catalogNumber"),
+        ),
+        fields_terminated_by="\\t",
+        ignore_header_lines=1,
+        id_index=0,
+    )
+
+
+def test_processing_maps_each_archive_file_to_its_own_output(tmp_path: Path, mocker: Any) -> None:
+    pipeline = _pipeline(tmp_path)
+    pipeline.config.output_dir.mkdir()
+    extract_dir = pipeline.config.extract_dir
+    (extract_dir / "meta.xml").write_text("<archive/>")
+    (extract_dir / "occurrence.txt").write_text("id\tcatalogNumber\n1\tNHRS-001\n")
+    (extract_dir / "occurrence_2.txt").write_text("id\tcatalogNumber\n2\tNHRS-002\n")
+    (extract_dir / "occurrence.csv").write_text("id,catalogNumber\n3,NHRS-003\n")
+    core = _occurrence_metadata(extract_dir / "occurrence.txt")
+
+    # Two archive files sharing a stem would write the same output file.
+    mocker.patch(
+        "main.parse_meta_xml",
+        return_value=ArchiveMetadata(core, [_occurrence_metadata(extract_dir / "occurrence.csv")]),
+    )
+    with pytest.raises(ETLError, match="same output file"):
+        pipeline._run_processing_phase()
+    assert not any(pipeline.config.output_dir.iterdir())
+
+    # Chunk files such as occurrence_2.txt are found next to occurrence.txt.
+    mocker.patch("main.parse_meta_xml", return_value=ArchiveMetadata(core, []))
+    pipeline._run_processing_phase()
+
+    output = (pipeline.config.output_dir / "occurrence.txt").read_text()
+    assert output.splitlines() == ["occurrenceID\tcatalogNumber", "1\tNHRS-001", "2\tNHRS-002"]
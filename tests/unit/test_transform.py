@@ -0,0 +1,141 @@
+import logging
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pytest
+
+from etl.exceptions import TransformationError
+from etl.extract import FieldMetadata, FileMetadata
+from etl.load import save_batches_to_file
+from etl.transform import MAX_BAD_LINE_WARNINGS, transform_extension_data
+
+
+def _occurrence_metadata(tmp_path: Path) -> FileMetadata:
+    return FileMetadata(
+        file_path=tmp_path / "occurrence.txt",
+        row_type="http://rs.tdwg.org/dwc/terms/Occurrence",
+        fields=(
+            FieldMetadata(index=0, term="http://rs.tdwg.org/dwc/terms/occurrenceID"),
+            FieldMetadata(index=1, term="http://rs.tdwg.org/dwc/terms/catalogNumber"),
+            FieldMetadata(index=None, term="http://rs.tdwg.org/dwc/terms/basisOfRecord", default="PreservedSpecimen"),
+        ),
+        fields_terminated_by="\\t",
+        ignore_header_lines=1,
+        id_index=0,
+    )
+
+
+def _transform_and_save(tmp_path: Path, files: list[str], **kwargs: Any) -> str:
+    file_metadata = _occurrence_metadata(tmp_path)
+    header, defaults = file_metadata.get_header(core_id_column_name="occurrenceID")
+    reader = transform_extension_data(files, file_metadata, header, defaults, **kwargs)
+    output_path = tmp_path / "output.txt"
+    save_batches_to_file(reader, str(output_path))
+    return output_path.read_text()
+
+
+def test_transform_deduplicates_across_files_and_injects_defaults(tmp_path: Path) -> None:
+    first = tmp_path / "occurrence.txt"
+    first.write_text("id\tcatalogNumber\n1\tNHRS-001\n2\tNHRS-002\n1\tNHRS-001\n")
+    second = tmp_path / "occurrence_2.txt"
+    second.write_text('id\tcatalogNumber\n2\tNHRS-002\n3\tNHRS 003, "dup"\n')
+
+    output = _transform_and_save(tmp_path, [str(first), str(second)])
+
+    assert output.splitlines() == [
+        "occurrenceID\tcatalogNumber\tbasisOfRecord",
+        "1\tNHRS-001\tPreservedSpecimen",
+        "2\tNHRS-002\tPreservedSpecimen",
+        '3\t"NHRS 003, ""dup"""\tPreservedSpecimen',
+    ]
+
+
+def test_transform_deduplicates_on_configured_columns(tmp_path: Path) -> None:
+    data = tmp_path / "occurrence.txt"
+    data.write_text("id\tcatalogNumber\n1\tNHRS-001\n2\tNHRS-001\n3\tNHRS-002\n")
+
+    output = _transform_and_save(tmp_path, [str(data)], deduplicate_columns=["catalogNumber"])
+
+    assert [line.split("\t")[0] for line in output.splitlines()[1:]] == ["1", "3"]
+
+
+def test_transform_skips_bad_lines(tmp_path: Path) -> None:
+    data = tmp_path / "occurrence.txt"
+    data.write_text("id\tcatalogNumber\n1\tNHRS-001\n2\tNHRS-002\textra\n00042\t\n")
+
+    output = _transform_and_save(tmp_path, [str(data)], on_bad_lines="skip")
+
+    assert output.splitlines()[1:] == ["1\tNHRS-001\tPreservedSpecimen", "00042\t\tPreservedSpecimen"]
+
+
+@pytest.mark.parametrize("on_bad_lines", ["warn", "error", "skip"])
+def test_transform_pads_short_rows(tmp_path: Path, on_bad_lines: str) -> None:
+    data = tmp_path / "occurrence.txt"
+    data.write_text('id\tcatalogNumber\n1\tNHRS-001\n9\n"10\n"\n')
+
+    output = _transform_and_save(tmp_path, [str(data)], on_bad_lines=on_bad_lines)
+
+    assert output.splitlines()[1:] == [
+        "1\tNHRS-001\tPreservedSpecimen",
+        "9\t\tPreservedSpecimen",
+        '"10',
+        '"\t\tPreservedSpecimen',
+    ]
+
+
+def test_transform_caps_bad_line_warnings(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    data = tmp_path / "occurrence.txt"
+    bad_rows = "".join(f"{i}\tNHRS-{i}\textra\n" for i in range(MAX_BAD_LINE_WARNINGS + 5))
+    data.write_text("id\tcatalogNumber\n1\tNHRS-001\n" + bad_rows + "2\n")
+
+    with caplog.at_level(logging.WARNING):
+        output = _transform_and_save(tmp_path, [str(data)], on_bad_lines="warn")
+
+    # The short row is padded and kept, so it is neither warned about nor counted.
+    assert output.splitlines()[1:] == ["1\tNHRS-001\tPreservedSpecimen", "2\t\tPreservedSpecimen"]
+    skip_messages = [r.message for r in caplog.records if r.message.startswith("Skipping line")]
+    assert len(skip_messages) == MAX_BAD_LINE_WARNINGS
+    assert f"Skipped {MAX_BAD_LINE_WARNINGS + 5} lines with too many fields" in caplog.text
+
+
+def test_transform_logs_bad_lines_once_when_data_is_wider_than_header(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    data = tmp_path / "occurrence.txt"
+    data.write_text("id\tcatalogNumber\textra\n1\tNHRS-001\tx\n2\tNHRS-002\tx\tx\n")
+
+    with caplog.at_level(logging.WARNING):
+        output = _transform_and_save(tmp_path, [str(data)], on_bad_lines="warn")
+
+    assert output.splitlines()[1:] == ["1\tNHRS-001\tx\tPreservedSpecimen"]
+    assert len([r for r in caplog.records if r.message.startswith("Skipping line")]) == 1
+
+
+def test_transform_rejects_unknown_deduplicate_columns(tmp_path: Path) -> None:
+    data = tmp_path / "occurrence.txt"
+    data.write_text("id\tcatalogNumber\n1\tNHRS-001\n")
+
+    with pytest.raises(TransformationError):
+        _transform_and_save(tmp_path, [str(data)], deduplicate_columns=["recordedBy"])
+
+
+def test_transform_categorical_columns_round_trip(tmp_path: Path) -> None:
+    data = tmp_path / "occurrence.txt"
+    data.write_text("id\tcatalogNumber\n1\tNHRS\n2\tNHRS\n1\tNHRS\n3\tNRM\n")
+
+    file_metadata = _occurrence_metadata(tmp_path)
+    header, defaults = file_metadata.get_header(core_id_column_name="occurrenceID")
+    reader = transform_extension_data(
+        [str(data)], file_metadata, header, defaults, categorical_columns=["catalogNumber"]
+    )
+    assert pa.types.is_dictionary(reader.schema.field("catalogNumber").type)
+    reader.close()
+
+    output = _transform_and_save(tmp_path, [str(data)], categorical_columns=["catalogNumber"])
+
+    assert output.splitlines()[1:] == [
+        "1\tNHRS\tPreservedSpecimen",
+        "2\tNHRS\tPreservedSpecimen",
+        "3\tNRM\tPreservedSpecimen",
+    ]